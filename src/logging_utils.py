@@ -1,14 +1,52 @@
 # src/logging_utils.py
 #23 May 2025
 
+import atexit
 import logging
+import os
+import queue
 import shutil
-from datetime import datetime
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from src.system.safety import require_safe_path
 
-TIMESTAMP = datetime.now().strftime("%Y%m%d.%H%M")
 CURRENT_LOG_FILE = None
+LOG_MAX_BYTES = 5_000_000  # per file before rolling over to .1, .2, ...
+LOG_BACKUP_COUNT = 3
+_FORMATTER = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+_LISTENER = None  # QueueListener writing records to CURRENT_LOG_FILE off the calling thread
+_QUEUE = queue.Queue(-1)  # outlives listeners, so records logged while one is swapped out are not lost
+_QUEUE_HANDLER = QueueHandler(_QUEUE)
+
+def _stop_listener():
+    """Flushes queued records to disk and closes the file handler."""
+    global _LISTENER
+    if _LISTENER is None:
+        return
+    _LISTENER.stop()
+    for handler in _LISTENER.handlers:
+        handler.close()
+    _LISTENER = None
+
+atexit.register(_stop_listener)
+
+def _move_log_set(old: Path, new: Path) -> bool:
+    """Moves a log file and its rotated backups; returns False if the log itself could not be moved."""
+    for suffix in [""] + [f".{i}" for i in range(1, LOG_BACKUP_COUNT + 1)]:
+        src = old.with_name(old.name + suffix)
+        if not src.exists():
+            continue
+        dst = new.with_name(new.name + suffix)
+        try:
+            os.replace(src, dst)  # rename, no byte copy on the same volume
+        except OSError:
+            try:
+                shutil.copy2(src, dst)
+            except OSError:
+                if not suffix:
+                    return False
+    return True
 
 def configure_logger(log_dir: Path, reuse_existing: bool = False, level=logging.INFO) -> Path:
     """
@@ -18,29 +56,49 @@ def configure_logger(log_dir: Path, reuse_existing: bool = False, level=logging.
     - level: logging level (default is logging.INFO)
     Returns: Path to CURRENT_LOG_FILE
     """
-    global CURRENT_LOG_FILE
+    global CURRENT_LOG_FILE, _LISTENER
 
     require_safe_path(log_dir, "Logging Directory")
     log_dir.mkdir(parents=True, exist_ok=True)
 
+    # Release the current file first so it can be moved (Windows won't rename an open file).
+    # The root QueueHandler stays attached; records queue up until the new listener starts.
+    _stop_listener()
+
+    move_failed_from = None
     if not reuse_existing or CURRENT_LOG_FILE is None:
-        CURRENT_LOG_FILE = log_dir / f"media_mender_{TIMESTAMP}.log"
+        timestamp = time.strftime("%Y%m%d.%H%M")
+        CURRENT_LOG_FILE = log_dir / f"media_mender_{timestamp}.log"
     else:
         new_path = log_dir / CURRENT_LOG_FILE.name
-        if CURRENT_LOG_FILE.resolve() != new_path.resolve():
-            if CURRENT_LOG_FILE.exists():
-                shutil.copy2(CURRENT_LOG_FILE, new_path)
-        CURRENT_LOG_FILE = new_path
-
-        for handler in logging.root.handlers[:]:
-            logging.root.removeHandler(handler)
-            handler.close()
-
-    logging.basicConfig(
-        filename=CURRENT_LOG_FILE,
-        filemode="a" if reuse_existing else "w",
-        level=level,
-        format="%(asctime)s [%(levelname)s] %(message)s"
+        if CURRENT_LOG_FILE.resolve() != new_path.resolve() and CURRENT_LOG_FILE.exists():
+            if _move_log_set(CURRENT_LOG_FILE, new_path):
+                CURRENT_LOG_FILE = new_path
+            else:
+                move_failed_from = CURRENT_LOG_FILE  # keep logging where we were
+        else:
+            CURRENT_LOG_FILE = new_path
+
+    handler = RotatingFileHandler(
+        CURRENT_LOG_FILE,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8"
     )
+    handler.setFormatter(_FORMATTER)
+
+    # Callers only enqueue; formatting and disk writes happen on the listener's thread
+    _LISTENER = QueueListener(_QUEUE, handler, respect_handler_level=True)
+    _LISTENER.start()
+    for old_handler in logging.root.handlers[:]:
+        if old_handler is not _QUEUE_HANDLER:
+            logging.root.removeHandler(old_handler)
+            old_handler.close()
+    if _QUEUE_HANDLER not in logging.root.handlers:
+        logging.root.addHandler(_QUEUE_HANDLER)
+    logging.root.setLevel(level)
+
+    if move_failed_from is not None:
+        logging.getLogger(__name__).warning(f"Could not move log to {log_dir}; still writing to {move_failed_from}")
 
-    return CURRENT_LOG_FILE
\ No newline at end of file
+    return CURRENT_LOG_FILE
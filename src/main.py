@@ -2,12 +2,11 @@
 #23 May 2025
 
 # --- Standard Library ---
-import json
 import logging
-import os
 import sys
-import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Generator, Iterable
 
@@ -24,7 +23,7 @@ from src.dialog import ThemedMessage
 from src.drag_drop_table import NoFocusDelegate, DragDropSortableTable
 from src.preferences import _load_config, get_log_path, get_whisper_model, load_column_widths, save_column_widths
 from src.processing.common_utils import ensure_whisper_model_installed, install_ffmpeg_if_needed
-from src.processing.media_processor import detect_media_type, process_media
+from src.processing.media_processor import process_media
 from src.style import get_base_stylesheet
 from src.theme_manager import apply_theme
 from src.logging_utils import configure_logger, CURRENT_LOG_FILE
@@ -32,10 +31,14 @@ from models.media_item import MediaItem, get_media_items
 from src.system.safety import require_safe_path
 
 
-gui_lock = threading.Lock()
+PATH_CHECK_TTL = 2.0  # seconds a passing check_required_paths result is reused
 CONFIG_PATH = Path(__file__).parent.parent / "config" / "config.json"
-log_dir = get_log_path()
-configure_logger(log_dir, level=logging.DEBUG)
+RESOURCES_DIR = Path(__file__).parent.parent / "resources"
+
+@lru_cache(maxsize=None)
+def _icon(name: str) -> QIcon:
+    # Decoded once per file; Qt shares the pixmap data between every widget using it
+    return QIcon(str(RESOURCES_DIR / name))
 
 class DryRunLoggingAdapter(logging.LoggerAdapter):
     def __init__(self, logger, dry_run=False):
@@ -62,15 +65,18 @@ class WorkerThread(QThread):
         self.running = True
 
     def run(self):
-        for i, file in enumerate(self.files):
+        # One file at a time: process_media is not safe to run concurrently. Sibling episodes fuzzy-match (and then
+        # trash) each other's subtitles, and move_to_trash picks unique names with a check-then-rename.
+        total = len(self.files)
+        for i, item in enumerate(self.files):
             if not self.running:
                 break
 
-            filename = os.path.basename(file)
-            self.update_progress.emit(int((i + 1) / len(self.files) * 100), filename)
+            filename = item.basename
+            self.update_progress.emit(int((i + 1) / total * 100), filename)
 
             try:
-                process_media(Path(file), self.output_dir, self.trash_dir, self.dry_run, logger=self.logger)
+                process_media(item.path, self.output_dir, self.trash_dir, self.dry_run, logger=self.logger)
                 self.logger.info(f"Processed file: {filename}")
                 success = True
             except Exception as e:
@@ -91,7 +97,10 @@ class MediaMender(QMainWindow):
         self.worker = None
 
         self.media_items: list[MediaItem] = []
+        self._path_index: set[Path] = set()  # resolved paths of queued files, kept in step with media_items
         self.config = self.load_config()
+        self._path_check_ok_at = None  # monotonic time of the last passing check_required_paths
+        self._row_number_digits = 0  # digits in the last row count renumber_table sized column 0 for
 
         self.dry_run = self.config.get("dry_run", True)
         self.logger = DryRunLoggingAdapter(logging.getLogger(__name__), dry_run=self.dry_run)
@@ -99,111 +108,48 @@ class MediaMender(QMainWindow):
         self.setup_ui()
 
     def setup_ui(self):
+        # The window inherits the app palette, so one palette serves every colour below
         palette = self.palette()
         bg_idle = palette.color(QPalette.Button).name()
         bg_hover = palette.color(QPalette.Highlight).name()
-        fg_color = palette.color(QPalette.ButtonText).name()
         text_color = palette.color(QPalette.ButtonText).name()
-
-        palette = app.palette()
-        tooltip_bg = palette.color(QPalette.ToolTipBase).name()
-        tooltip_fg = palette.color(QPalette.ToolTipText).name()
-        tooltip_border = palette.color(QPalette.Mid).name()  # subtle border
-        app.setStyleSheet(app.styleSheet() + f"""
-            QToolTip {{
-                background-color: {tooltip_bg};
-                color: {tooltip_fg};
-                border: 1px solid {tooltip_border};
-                padding: 5px;
-                border-radius: 4px;
-            }}
-        """)
+        border_color = palette.color(QPalette.Light).name()
 
 
         self.preferences_button = QPushButton()
-        icon_path = Path(__file__).parent.parent / "resources" / "gear.png"
-        self.preferences_button.setIcon(QIcon(str(icon_path)))
+        self.preferences_button.setIcon(_icon("gear.png"))
         self.preferences_button.setToolTip("Preferences")
         self.preferences_button.setFixedSize(40, 40)
         self.preferences_button.setIconSize(QSize(24, 24))
-        self.preferences_button.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {bg_idle};
-                        color: {text_color};
-                        border-radius: 6px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {bg_hover};
-                    }}
-                """)
+        self.preferences_button.setObjectName("topbar")
         self.preferences_button.clicked.connect(self.open_preferences)
 
         self.play_button = QPushButton()
-        icon_path = Path(__file__).parent.parent / "resources" / "start.png"
-        self.play_button.setIcon(QIcon(str(icon_path)))
+        self.play_button.setIcon(_icon("start.png"))
         self.play_button.setToolTip("Start Processing")
         self.play_button.setFixedSize(40, 40)
         self.play_button.setIconSize(QSize(24, 24))
-        self.play_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {bg_idle};
-                color: {text_color};
-                border-radius: 6px;
-            }}
-            QPushButton:hover {{
-                background-color: {bg_hover};
-            }}
-        """)
+        self.play_button.setObjectName("topbar")
         self.play_button.clicked.connect(self.start_processing)
 
         self.stop_button = QPushButton()
-        icon_path = Path(__file__).parent.parent / "resources" / "stop.png"
-        self.stop_button.setIcon(QIcon(str(icon_path)))
+        self.stop_button.setIcon(_icon("stop.png"))
         self.stop_button.setToolTip("Stop Processing")
         self.stop_button.setFixedSize(40, 40)
         self.stop_button.setIconSize(QSize(24, 24))
-        self.stop_button.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {bg_idle};
-                        color: {text_color};
-                        border-radius: 6px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {bg_hover};
-                    }}
-                """)
+        self.stop_button.setObjectName("topbar")
         self.stop_button.clicked.connect(self.stop_processing)
 
         self.load_button = QPushButton("Load")
         self.load_button.setToolTip("Load Files")
         self.load_button.setFixedSize(60, 40)
-        self.load_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {bg_idle};
-                color: {text_color};
-                border-radius: 6px;
-                font-size: 17px;
-            }}
-            QPushButton:hover {{
-                background-color: {bg_hover};
-            }}
-        """)
+        self.load_button.setObjectName("topbar")
         self.load_button.clicked.connect(self.load_files)
 
         self.unload_button = QPushButton("Unload")
         self.unload_button.setToolTip("Unload All Files")
         self.unload_button.setFixedSize(80, 40)
-        self.unload_button.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {bg_idle};
-                        color: {text_color};
-                        border-radius: 6px;
-                        font-size: 17px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {bg_hover};
-                    }}
-                """)
+        self.unload_button.setObjectName("topbar")
         self.unload_button.clicked.connect(self.unload_files)
 
         self.progress = QProgressBar()
@@ -220,14 +166,24 @@ class MediaMender(QMainWindow):
 
         central = QWidget()
         central.setAcceptDrops(True)
+        # One parse for every top-bar button instead of a stylesheet per widget
+        central.setStyleSheet(f"""
+            QPushButton#topbar {{
+                background-color: {bg_idle};
+                color: {text_color};
+                border-radius: 6px;
+                font-size: 17px;
+            }}
+            QPushButton#topbar:hover {{
+                background-color: {bg_hover};
+            }}
+        """)
         layout = QVBoxLayout()
 
         self.table = DragDropSortableTable()
         self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.setItemDelegate(NoFocusDelegate())
 
-        border_color = palette.color(QPalette.Light).name()
-
         header = self.table.header()
         header.sectionClicked.connect(self.renumber_table)
         #header = self.table.horizontalHeader()
@@ -252,6 +208,7 @@ class MediaMender(QMainWindow):
 
         # Restore saved column widths
         saved_widths = load_column_widths()
+        self._saved_widths = saved_widths  # closeEvent only writes when these no longer match
         if saved_widths:
             for i, width in enumerate(saved_widths, start=1):  # start at 1 to skip column 0
                 if i < self.table.model.columnCount():
@@ -280,12 +237,20 @@ class MediaMender(QMainWindow):
 
         # Step 1: Wrap into MediaItems
         new_items = []
+        failed = []
         for p in file_paths:
             try:
-                new_items.append(MediaItem(path=Path(p), source='drag'))
+                new_items.append(MediaItem(path=p, source='drag'))
             except Exception as e:
                 self.logger.warning(f"[DROP] Failed to create MediaItem for {p}: {e}")
-                ThemedMessage.critical(self, "Invalid File", f"Could not load file:\n{p}")
+                failed.append(str(p))
+
+        if failed:
+            # One dialog for the whole drop; a modal per bad path freezes large drops
+            shown = "\n".join(failed[:10])
+            if len(failed) > 10:
+                shown += f"\n...and {len(failed) - 10} more"
+            ThemedMessage.critical(self, "Invalid File", f"Could not load {len(failed)} file(s):\n{shown}")
 
         if not new_items:
             self.logger.info("No valid files to process after drop.")
@@ -315,12 +280,11 @@ class MediaMender(QMainWindow):
     def open_preferences(self):
         pref = PreferencesWindow(self)
         pref.exec()
+        self.config = self.load_config()  # a cache hit unless the dialog saved
+        self._path_check_ok_at = None  # directories may have been changed
 
     def load_config(self):
-        if not os.path.exists(CONFIG_PATH):
-            return {}
-        with open(CONFIG_PATH, "r") as f:
-            return json.load(f)
+        return _load_config()
 
     def unload_files(self):
         if not self.media_items:
@@ -330,6 +294,7 @@ class MediaMender(QMainWindow):
 
         if response == "Yes":
             self.media_items.clear()
+            self._path_index.clear()
             self.table.model.removeRows(0, self.table.model.rowCount())
             self.renumber_table()
             self.logger.info("All files have been unloaded.")
@@ -351,6 +316,7 @@ class MediaMender(QMainWindow):
 
         # Keep dragged items
         self.media_items = [item for item in self.media_items if item.source == 'drag']
+        self._path_index = {item.path for item in self.media_items if not item.is_folder}
 
         # Load new items from folder
         new_items = get_media_items(input_dir, source='load')
@@ -359,7 +325,6 @@ class MediaMender(QMainWindow):
         deduplicated_items = self.filter_new_media_items(new_items)
         if deduplicated_items:
             self.media_items.extend(deduplicated_items)
-            self.table.load_items(self.media_items)
         else:
             self.logger.info("All loaded files were duplicates. No items added.")
         self.table.load_items(self.media_items)
@@ -376,12 +341,9 @@ class MediaMender(QMainWindow):
         """
         Filters out MediaItems whose resolved file paths already exist in self.media_items.
         Folders are accepted but never deduplicated or skipped.
+        Accepted files are recorded in self._path_index, so callers must queue what is returned.
         """
-        try:
-            existing_paths = {item.path.resolve(strict=True) for item in self.media_items if not item.path.is_dir()}
-        except Exception as e:
-            self.logger.error(f"Failed to resolve existing media paths: {e}")
-            existing_paths = set()
+        existing_paths = self._path_index
 
         deduplicated = []
         skipped = 0
@@ -396,23 +358,25 @@ class MediaMender(QMainWindow):
 
             self.logger.debug(f"[COMPARE] Resolved new: {resolved}")
 
-            if item.path.is_dir():
+            if item.is_folder:
                 self.logger.debug(f"[FOLDER] Accepted folder (no dedup): {resolved}")
                 deduplicated.append(item)
                 continue
 
-            if resolved in existing_paths:
-                self.logger.info(f"[SKIPPED] Duplicate file (exact path): {resolved}")
+            # Batch check first: accepted files also land in existing_paths
+            if resolved in new_paths_seen:
+                self.logger.info(f"[SKIPPED] Duplicate within new batch: {resolved}")
                 skipped += 1
                 continue
 
-            if resolved in new_paths_seen:
-                self.logger.info(f"[SKIPPED] Duplicate within new batch: {resolved}")
+            if resolved in existing_paths:
+                self.logger.info(f"[SKIPPED] Duplicate file (exact path): {resolved}")
                 skipped += 1
                 continue
 
             self.logger.debug(f"[ADDED] Accepted new file: {resolved}")
             new_paths_seen.add(resolved)
+            existing_paths.add(resolved)
             deduplicated.append(item)
 
         if skipped:
@@ -426,22 +390,20 @@ class MediaMender(QMainWindow):
 
     def remove_file_at_row(self, row):
         if 0 <= row < len(self.media_items):
-            removed_path = self.media_items.pop(row)
-            filename = Path(removed_path).name
-            self.logger.info(f"Removed file from queue: {filename}")
+            removed_item = self.media_items.pop(row)
+            self._path_index.discard(removed_item.path)
+            self.logger.info(f"Removed file from queue: {removed_item.basename}")
         else:
             self.logger.warning(f"Tried to remove invalid row: {row}")
 
         self.table.model.removeRow(row)
 
     def renumber_table(self):
-        #for row in range(self.table.rowCount()):
-        for row in range(self.table.model.rowCount()):
-            item = QStandardItem(str(row + 1))
-            item.setEditable(False)
-            item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            self.table.model.setItem(row, 0, item)
-        self.table.resizeColumnToContents(0)
+        # Updates the existing column-0 items in place (they own the folder subtrees)
+        digits = len(str(self.table.renumber_visible_rows()))
+        if digits != self._row_number_digits:  # the widest number sets the column width
+            self._row_number_digits = digits
+            self.table.resizeColumnToContents(0)
 
     def start_processing(self):
         if not self.media_items:
@@ -470,8 +432,9 @@ class MediaMender(QMainWindow):
 
         self.update_file_order()
         self.worker = WorkerThread(self.media_items, self.output_dir, self.trash_dir, self.log_dir, self.dry_run)
-        self.worker.update_progress.connect(self.update_progress)
-        self.worker.file_done.connect(self.mark_file)
+        # Queued: the slots run on the GUI thread in emission order, so they need no locking
+        self.worker.update_progress.connect(self.update_progress, Qt.QueuedConnection)
+        self.worker.file_done.connect(self.mark_file, Qt.QueuedConnection)
         self.worker.start()
 
     def stop_processing(self):
@@ -498,19 +461,36 @@ class MediaMender(QMainWindow):
         #self.table.model.setSupportedDragActions(Qt.MoveAction)
 
     def update_progress(self, value, filename):
-        with gui_lock:
-            self.progress.setValue(value)
-            self.status_label.setText(f"Processing: {filename}")
+        self.progress.setValue(value)
+        self.status_label.setText(f"Processing: {filename}")
 
     def mark_file(self, row, success):
-        with gui_lock:
+        model = self.table.model
+        colour = Qt.GlobalColor.green if success else Qt.GlobalColor.red
+        status = "Done" if success else "Errored"
+
+        # Edit the row in place with signals held, then announce it as one change
+        signals_blocked = model.blockSignals(True)
+        try:
             for col in range(3):
-                item = self.table.model.item(row, col)
+                item = model.item(row, col)
                 if item:
-                    item.setBackground(Qt.GlobalColor.green if success else Qt.GlobalColor.red)
-            self.table.model.setItem(row, 3, QStandardItem("Done" if success else "Errored"))
+                    item.setBackground(colour)
+            status_item = model.item(row, 3)
+            if status_item is None:
+                status_item = QStandardItem()
+                model.setItem(row, 3, status_item)
+            status_item.setText(status)
+        finally:
+            model.blockSignals(signals_blocked)
+        model.dataChanged.emit(model.index(row, 0), model.index(row, 3), [Qt.BackgroundRole, Qt.DisplayRole])
 
     def check_required_paths(self) -> bool:
+        # Stat calls on network drives can stall the GUI; reuse a recent pass
+        now = time.monotonic()
+        if self._path_check_ok_at is not None and now - self._path_check_ok_at < PATH_CHECK_TTL:
+            return True
+
         config = _load_config()
 
         try:
@@ -537,78 +517,43 @@ class MediaMender(QMainWindow):
             self.logger.error(str(e))
             return False
 
+        # Only passes are cached, so fixing a missing directory takes effect on the next click
+        self._path_check_ok_at = now
         return True
 
     def update_file_order(self):
+        # Pre-order walk with an explicit stack; children are pushed reversed so they pop in display order
         new_order = []
-
-        def walk_items(parent_item: QStandardItem):
-            for i in range(parent_item.rowCount()):
-                row_item = parent_item.child(i, 0)
-                media_item = row_item.data(Qt.UserRole)
-                if media_item:
-                    new_order.append(media_item)
-                if row_item.hasChildren():
-                    walk_items(row_item)
-
-        for i in range(self.table.model.rowCount()):
-            folder_item = self.table.model.item(i, 0)
-            folder_media_item = folder_item.data(Qt.UserRole)
-            if folder_media_item:
-                new_order.append(folder_media_item)
-            if folder_item.hasChildren():
-                walk_items(folder_item)
+        root = self.table.model.invisibleRootItem()
+        stack = [root.child(i, 0) for i in range(root.rowCount() - 1, -1, -1)]
+        while stack:
+            row_item = stack.pop()
+            media_item = row_item.data(Qt.UserRole)
+            if media_item:
+                new_order.append(media_item)
+            if row_item.hasChildren():
+                stack.extend(row_item.child(i, 0) for i in range(row_item.rowCount() - 1, -1, -1))
 
         self.media_items = new_order
-
-    def dropEvent_OLD(self, event):
-        if not self.table.selectedIndexes():
-            return
-
-        global_pos = event.position().toPoint() if hasattr(event, 'position') else event.pos()
-        if self.table.is_cursor_within_viewport(global_pos):
-            return  # Let the table handle it normally
-
-        cursor_pos = self.table.mapFromGlobal(global_pos)
-        if cursor_pos.y() < 0:
-            target_row = 0
-        elif cursor_pos.y() > self.table.viewport().height():
-            target_row = self.table.model.rowCount()
-        else:
-            return
-
-        source_row = self.table.selectedIndexes()[0].row()
-        if target_row > source_row:
-            target_row -= 1
-
-        items = []
-        for col in range(self.table.model.columnCount()):
-            cell = self.table.model.item(source_row, col)
-            if cell is not None:
-                items.append(cell.clone())
-        self.table.model.removeRow(source_row)
-        self.table.model.insertRow(target_row, items)
-        self.table.renumber_visible_rows()
-
-        self.table._drag_hover_pos = None
-        self.table.viewport().update()
-        event.acceptProposedAction()
+        # Rows can leave the table without going through remove_file_at_row (the context-menu Remove)
+        self._path_index = {item.path for item in new_order if not item.is_folder}
 
     def dragEnterEvent(self, event):
         event.acceptProposedAction()
 
     def closeEvent(self, event):
         widths = [self.table.columnWidth(i) for i in range(1, self.table.model.columnCount())]
-        save_column_widths(widths)
+        if widths != self._saved_widths:
+            save_column_widths(widths)
         super().closeEvent(event)
 
 
 if __name__ == "__main__":
+    configure_logger(get_log_path(), level=logging.DEBUG)
     app = QApplication(sys.argv)
     apply_theme(app, load_theme())
     app.setStyleSheet(get_base_stylesheet())
-    icon_path = Path(__file__).parent.parent / "resources" / "Icon.JPG"
-    app.setWindowIcon(QIcon(str(icon_path)))
+    app.setWindowIcon(_icon("Icon.JPG"))
     window = MediaMender(app)
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
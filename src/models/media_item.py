@@ -9,41 +9,48 @@ from src.system.safety import require_safe_path
 import logging
 
 class MediaItem:
-    def __init__(self, path: Path, source: str, root: Optional[Path] = None):
-        self.path = path.resolve()
+    __slots__ = (
+        "path", "source", "is_folder", "status", "media_type", "extension", "basename",
+        "parent_folder", "relative_path", "depth", "group_path", "_group_id", "indent_level",
+    )
+
+    def __init__(self, path: Path, source: str, root: Optional[Path] = None, is_folder: Optional[bool] = None,
+                 resolved: bool = False):
+        self.path = path if resolved else path.resolve()  # get_media_items hands over canonical paths already
         self.source = source  # 'drag' or 'load'
-        self.is_folder = self.path.is_dir()
+        self.is_folder = self.path.is_dir() if is_folder is None else is_folder  # callers that walked the dir already know
         self.status = "Pending"
+        self.media_type = "Folder" if self.is_folder else None  # filled once by the table, then reused
         self.extension = self.path.suffix.lower()
         self.basename = self.path.name
         self.parent_folder = self.path.parent
 
-        self.relative_path = (
-            self.path.relative_to(root) if root and root in self.path.parents else None
-        )
-        self.depth = len(self.relative_path.parts) if self.relative_path else 0
-
+        self.relative_path = None
         self.group_path = None
-        self.group_id = None
-        if root and root in self.path.parents:
+        self._group_id = None  # hashed from group_path on first access
+        if root and self.path != root:
             try:
-                if root and (self.path == root or root in self.path.parents):
-                    relative = self.path.relative_to(root)
-                    if relative.parts:
-                        top_level = root / relative.parts[0]
-                        self.group_path = top_level
-                        self.group_id = hashlib.md5(str(top_level).encode()).hexdigest()
-            except Exception:
-                self.group_path = None
-                self.group_id = None
+                self.relative_path = self.path.relative_to(root)
+            except ValueError:
+                pass
+            else:
+                self.group_path = root / self.relative_path.parts[0]
+        self.depth = len(self.relative_path.parts) if self.relative_path else 0
         self.indent_level = self.depth  # <-- 🔥 ADD THIS LINE HERE
 
+    @property
+    def group_id(self) -> Optional[str]:
+        if self._group_id is None and self.group_path is not None:
+            self._group_id = hashlib.md5(str(self.group_path).encode()).hexdigest()
+        return self._group_id
+
     def to_dict(self) -> dict:
         return {
             "path": str(self.path),
             "source": self.source,
             "is_folder": self.is_folder,
             "status": self.status,
+            "media_type": self.media_type,
             "extension": self.extension,
             "basename": self.basename,
             "parent_folder": str(self.parent_folder) if self.parent_folder else None,
@@ -57,6 +64,26 @@ class MediaItem:
     def __repr__(self):
         return f"<MediaItem {self.basename} depth={self.depth} source={self.source}>"
 
+def _walk_entries(top: str):
+    """os.walk(top) without following links, but yielding DirEntry objects so callers get is_symlink() for free."""
+    stack = [top]
+    while stack:
+        dirpath = stack.pop()
+        dirs, files = [], []
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    (dirs if is_dir else files).append(entry)
+        except OSError:
+            continue  # os.walk skips unreadable directories too
+        yield dirpath, dirs, files
+        # Reversed so subfolders are visited in listing order, as os.walk does
+        stack.extend(d.path for d in reversed(dirs) if not d.is_symlink())
+
 def get_media_items(base_path: Path, source: str, logger=None) -> list[MediaItem]:
     items = []
     seen = set()
@@ -68,39 +95,30 @@ def get_media_items(base_path: Path, source: str, logger=None) -> list[MediaItem
         logger.error(str(e))
         return []
 
-    for root, dirs, files in os.walk(base_path):
-        root_path = Path(root)
-
-        # Add the current folder
-        try:
-            resolved = root_path.resolve(strict=True)
-            if resolved not in seen:
-                items.append(MediaItem(path=root_path, source=source, root=base_path))
-                seen.add(resolved)
-        except Exception as e:
-            logger.warning(f"[get_media_items] Failed to resolve folder {root_path}: {e}")
-
-        # Add subfolders
-        for d in dirs:
-            folder_path = root_path / d
-            try:
-                resolved = folder_path.resolve(strict=True)
-                if resolved not in seen:
-                    items.append(MediaItem(path=folder_path, source=source, root=base_path))
-                    seen.add(resolved)
-            except Exception as e:
-                logger.warning(f"[get_media_items] Failed to resolve subfolder {folder_path}: {e}")
-
-        # Add files
-        for f in files:
-            file_path = root_path / f
-            try:
-                resolved = file_path.resolve(strict=True)
-                if resolved not in seen:
-                    items.append(MediaItem(path=file_path, source=source, root=base_path))
-                    seen.add(resolved)
-            except Exception as e:
-                logger.warning(f"[get_media_items] Failed to resolve file {file_path}: {e}")
+    # Resolve the root once; below it only symlinks can point somewhere else
+    try:
+        base_path = base_path.resolve(strict=True)
+    except Exception as e:
+        logger.warning(f"[get_media_items] Failed to resolve folder {base_path}: {e}")
+        return []
+    items.append(MediaItem(path=base_path, source=source, root=base_path, is_folder=True, resolved=True))
+    seen.add(str(base_path))
+
+    for root, dirs, files in _walk_entries(str(base_path)):
+        for entries, is_folder in ((dirs, True), (files, False)):
+            for entry in entries:
+                key = entry.path
+                if entry.is_symlink():
+                    try:
+                        key = str(Path(key).resolve(strict=True))
+                    except Exception as e:
+                        kind = "subfolder" if is_folder else "file"
+                        logger.warning(f"[get_media_items] Failed to resolve {kind} {entry.path}: {e}")
+                        continue
+                if key not in seen:
+                    # key is the canonical path: entry.path below the resolved root, the target for links
+                    items.append(MediaItem(path=Path(key), source=source, root=base_path, is_folder=is_folder, resolved=True))
+                    seen.add(key)
 
     return items
 
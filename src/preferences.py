@@ -148,19 +148,18 @@ class PreferencesWindow(QDialog):
 
     def load_config(self, logger=None):
         logger = logger or logging.getLogger(__name__)
-        if not CONFIG_PATH.exists():
-            logger.warning("Config file missing. Using default settings.")
-            self.config = DEFAULT_CONFIG.copy()
-            return
-
         try:
-            with open(CONFIG_PATH, "r") as f:
-                loaded = json.load(f)
+            loaded = _load_config()  # shares the parsed copy; {} when the file is missing
         except json.JSONDecodeError:
             logger.error("Config file is corrupted. Using default settings.")
             self.config = DEFAULT_CONFIG.copy()
             return
 
+        if not loaded:
+            logger.warning("Config file missing. Using default settings.")
+            self.config = DEFAULT_CONFIG.copy()
+            return
+
         # Merge loaded config with defaults (fill missing or blank values)
         self.config = {}
         for key, default in DEFAULT_CONFIG.items():
@@ -202,6 +201,7 @@ class PreferencesWindow(QDialog):
         os.makedirs(CONFIG_PATH.parent, exist_ok=True)
         with open(CONFIG_PATH, "w") as f:
             json.dump(self.config, f, indent=2)
+        _invalidate_config_cache()
 
         dialog = ThemedMessage("Saved", "Preferences saved successfully.", self)
         dialog.setPalette(self.palette())  # Apply current theme
@@ -220,10 +220,8 @@ class PreferencesWindow(QDialog):
 # Utility functions for use in main.py
 def load_theme() -> ThemeMode:
     try:
-        with open(CONFIG_PATH, "r") as f:
-            data = json.load(f)
-            return ThemeMode(data.get("theme", "system"))
-    except (FileNotFoundError, json.JSONDecodeError, ValueError):
+        return ThemeMode(_load_config().get("theme", "system"))
+    except (json.JSONDecodeError, ValueError):
         return ThemeMode.SYSTEM
 
 #
@@ -236,11 +234,26 @@ def load_column_widths() -> list[int] | None:
     config = _load_config()
     return config.get("column_widths")
 
+_config_cache = (None, {})  # (st_mtime_ns, parsed config); swapped as one tuple so worker threads see a consistent pair
+
 def _load_config() -> dict:
-    if CONFIG_PATH.exists():
+    global _config_cache
+    try:
+        mtime = CONFIG_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    cached_mtime, data = _config_cache
+    if cached_mtime != mtime:
         with open(CONFIG_PATH, "r") as f:
-            return json.load(f)
-    return {}
+            data = json.load(f)
+        _config_cache = (mtime, data)
+    return dict(data)  # callers edit their copy before _write_config
+
+def _invalidate_config_cache():
+    """Forces the next _load_config to re-read; mtime alone can miss a write on coarse-timestamp filesystems."""
+    global _config_cache
+    _config_cache = (None, {})
 
 def _write_config(new_data: dict):
     config = _load_config()
@@ -248,6 +261,7 @@ def _write_config(new_data: dict):
     os.makedirs(CONFIG_PATH.parent, exist_ok=True)
     with open(CONFIG_PATH, "w") as f:
         json.dump(config, f, indent=2)
+    _invalidate_config_cache()
 
 def get_tmdb_api_key() -> str | None:
     config = _load_config()
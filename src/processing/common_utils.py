@@ -20,7 +20,6 @@ from typing import Any, Optional
 from urllib import parse, request
 
 #Third Party
-from faster_whisper import WhisperModel
 from spellchecker import SpellChecker
 from srt import Subtitle, compose
 from tmdbv3api import Movie, Search, TMDb, TV
@@ -34,7 +33,7 @@ from src.system.safety import is_safe_to_trash, is_safe_path, require_safe_path
 FFMPEG_URL = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
 FFMPEG_TARGET = Path("resources/ffmpeg/ffmpeg.exe")
 _ignored_names_cache = None
-spellchecker = SpellChecker(distance=1)
+_spellchecker = None  # built on first use; loading the dictionary is slow
 tmdb = TMDb()
 tmdb.api_key = get_tmdb_api_key() or ""
 tmdb.language = 'en'
@@ -77,6 +76,12 @@ def load_ignored_names() -> set[str]:
     return _ignored_names_cache
 ignored_names = load_ignored_names()
 
+def get_spellchecker() -> SpellChecker:
+    global _spellchecker
+    if _spellchecker is None:
+        _spellchecker = SpellChecker(distance=1)
+    return _spellchecker
+
 def detect_aspect_ratio(file_path: Path, logger=None) -> str:
     """Detects aspect ratio using ffprobe and returns a label: Fullscreen, Widescreen, or Ultrawide."""
     logger = logger or logging.getLogger(__name__)
@@ -160,6 +165,7 @@ def correct_subtitle_typos(text: str) -> tuple[str, list[dict]]:
     """
     corrected_lines = []
     correction_log = []
+    spellchecker = get_spellchecker()
 
     for idx, line in enumerate(text.splitlines(), start=1):
         if line.strip() == "" or re.match(r"^\d+$", line) or "-->" in line:
@@ -477,6 +483,7 @@ def generate_forced_subtitles_from_audio(file_path: Path, output_srt: Path, dry_
             logger.info(f"Would write forced subtitles to: {output_srt}")
             return True
 
+        from faster_whisper import WhisperModel  # pulls in CTranslate2; only pay for it when transcribing
         model_size = get_whisper_model()
         model = WhisperModel(model_size, compute_type="int8")
         segments, _ = model.transcribe(str(file_path), language=None)
@@ -513,6 +520,7 @@ def generate_normal_subtitles_from_audio(file_path: Path, output_srt: Path, dry_
             logger.info(f"Would write normal subtitles to: {output_srt}")
             return True
 
+        from faster_whisper import WhisperModel
         model_size = get_whisper_model()
         model = WhisperModel(model_size, compute_type="int8")
         segments, _ = model.transcribe(str(file_path), language="en")
@@ -556,6 +564,7 @@ def ensure_whisper_model_installed(model: str, progress_callback=None, dry_run:
 
         # This auto-downloads and caches the model
         if not dry_run:
+            from faster_whisper import WhisperModel
             WhisperModel(model, download_root=str(model_dir), compute_type="int8")
 
         if progress_callback:
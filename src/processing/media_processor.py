@@ -60,12 +60,11 @@ def process_media(file_path: Path, output_dir: Path, trash_dir: Path, dry_run: b
 def detect_media_type(file_path: Path, logger=None) -> str:
     ext = file_path.suffix.lower()
     logger = logger or logging.getLogger(__name__)
-    metadata = extract_metadata_from_filename(str(file_path), logger=logger)
 
     if ext in VIDEO_EXTENSIONS:
-        if metadata.get("season") is not None:
-            return "TV"
-        return "Movie"
+        # Only videos need the filename parsed (TV vs Movie)
+        metadata = extract_metadata_from_filename(str(file_path), logger=logger)
+        return "TV" if metadata.get("season") is not None else "Movie"
     elif ext in AUDIO_EXTENSIONS:
         return "Audiobook"
     elif ext in SUBTITLE_EXTENSIONS:
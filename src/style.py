@@ -128,4 +128,11 @@ def get_base_stylesheet() -> str:
     QTableWidget::item:focus {
         outline: none;
     }
+    QToolTip {
+        background-color: palette(tooltip-base);
+        color: palette(tooltip-text);
+        border: 1px solid palette(mid);
+        padding: 5px;
+        border-radius: 4px;
+    }
     """
\ No newline at end of file
@@ -4,6 +4,9 @@
 from pathlib import Path
 import logging
 
+_SAFE_PATHS = set()  # resolved paths already judged safe; rejections are re-checked so a new safe root counts at once
+_SAFE_PATHS_MAX = 512
+
 def get_safe_root_folders() -> list[Path]:
     """
     Returns the hardcoded list of safe user directories if they exist.
@@ -19,24 +22,29 @@ def is_safe_path(path: Path, logger=None) -> bool:
     logger = logger or logging.getLogger(__name__)
 
     try:
-        path = path.resolve()
-
-        if path == Path(path.anchor):  # Root of drive (e.g., C:\)
-            return False
-
-        for base in get_safe_root_folders():
-            if path.is_relative_to(base):
-                return True
+        return _is_resolved_path_safe(path.resolve())
+    except Exception as e:
+        logger.warning(f"[safety] Path resolution failed for {path}: {e}")
+        return False
 
-        for parent in path.parents:
-            if "mediamender" in parent.name.lower():
-                return True
+def _is_resolved_path_safe(path: Path) -> bool:
+    """
+    Safe-zone verdict for an already resolved path; passes are cached since the root scan stats every folder.
+    """
+    if path in _SAFE_PATHS:
+        return True
 
+    if path == Path(path.anchor):  # Root of drive (e.g., C:\)
         return False
 
-    except Exception as e:
-        logger.warning(f"[safety] Path resolution failed for {path}: {e}")
-        return False
+    safe = any(path.is_relative_to(base) for base in get_safe_root_folders()) or any(
+        "mediamender" in parent.name.lower() for parent in path.parents
+    )
+    if safe:
+        if len(_SAFE_PATHS) >= _SAFE_PATHS_MAX:
+            _SAFE_PATHS.clear()
+        _SAFE_PATHS.add(path)
+    return safe
 
 def is_safe_to_trash(path: Path, logger=None) -> bool:
     """